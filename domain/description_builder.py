@@ -2,10 +2,100 @@ from __future__ import annotations
 
 import logging
 import re
-from typing import Any, Dict, List, Optional
+from dataclasses import dataclass
+from functools import lru_cache
+from sys import intern
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 logger = logging.getLogger(__name__)
 
+# Performance : ne PAS passer ce module sous Numba (@njit) ni Cython.
+# Le coût est dominé par les accès dict/attributs et la manipulation de str,
+# domaine où Numba est plus lent que CPython (support des str limité, boxing
+# à chaque appel). Les gains viennent des regex précompilées, des constantes
+# de module et du cache lru des descriptions ; _format_percent et les helpers
+# numériques sont trop courts pour amortir une extension compilée.
+
+# Libellés statiques renvoyés à chaque description (internés une fois)
+_RISE_MID = intern("taille moyenne")
+_RISE_LOW = intern("taille basse")
+_RISE_HIGH = intern("taille haute")
+_FIT_UNKNOWN = intern("coupe non précisée")
+_FIT_BOOTCUT = intern("Bootcut/Évasé")
+_FIT_SKINNY = intern("Skinny")
+_FIT_STRAIGHT = intern("Straight/Droit")
+_COMPOSITION_UNREADABLE = intern("Composition non lisible (voir étiquettes en photo).")
+_STATE_GOOD = intern("Très bon état.")
+
+# Numéro de modèle Levi's (501, 505, 711...) extrait pour les hashtags
+_MODEL_NUMBER_RE = re.compile(r"(\d{3})")
+
+# Marqueurs de coupe (une seule passe regex au lieu de N tests "in")
+_BOOT_RE = re.compile(r"boot|flare|évas|evase|curve|curvy")
+# Côté hashtag, le texte est déjà normalisé é->e : on reste sur les marqueurs
+# explicites pour que "Evasé" donne #evasejean et non #bootcutjean
+_BOOT_HASHTAG_RE = re.compile(r"bootcut|boot cut|boot-cut|flare|curve|curvy")
+_SKINNY_RE = re.compile(r"skinny|slim")
+_STRAIGHT_RE = re.compile(r"straight|droit")
+
+# Classification des coupes, testée dans l'ordre : (regex, libellé, hashtag)
+_FIT_RULES = (
+    (_BOOT_RE, _FIT_BOOTCUT, "bootcut"),
+    (_SKINNY_RE, _FIT_SKINNY, "skinny"),
+    (_STRAIGHT_RE, _FIT_STRAIGHT, "straightdroit"),
+)
+_FIT_HASHTAG_RULES = ((_BOOT_HASHTAG_RE, _FIT_BOOTCUT, "bootcut"),) + _FIT_RULES[1:]
+
+# Tables de nettoyage des hashtags : une seule passe str.translate par token
+_HASHTAG_TRANS = str.maketrans("", "", " '-/")
+_FIT_TOKEN_TRANS = str.maketrans("", "", " /")
+_SPACE_TRANS = str.maketrans("", "", " ")
+
+# Valeurs rise_type "taille basse" et tokens modèle exclus des hashtags
+_RISE_LOW_TYPES = frozenset({"low", "ultra_low"})
+_MODEL_DROP_MARKERS = frozenset({"demi", "curve", "curvy", "cut"})
+
+# Combinaisons de tokens modèle fusionnées en un seul hashtag
+_SUPER_SKINNY = frozenset({"super", "skinny"})
+_SUPER_SLIM = frozenset({"super", "slim"})
+
+# Renvoi aux photos en fin de défauts, coupé sans tenir compte de la casse
+_VOIR_PHOTOS_RE = re.compile("voir photos", re.IGNORECASE)
+
+# Ligne footer complète (puces/espaces de tête tolérés), supprimée en une passe
+_FOOTER_RE = re.compile(
+    r"^(?:[#*\-]|[^\S\n])*(?:marque[^\S\n]*:|couleur[^\S\n]*:|taille[^\S\n]*:|sku)"
+    r"[^\n]*(?:\n|\Z)",
+    re.IGNORECASE | re.MULTILINE,
+)
+# Libellé footer dont le ":" est repoussé sur les lignes suivantes
+_FOOTER_SPAN_RE = re.compile(
+    r"^\s*(?:marque|couleur|taille|sku)\s*:[^\n]*",
+    re.IGNORECASE | re.MULTILINE,
+)
+_FOOTER_TAIL_RE = re.compile(
+    r"\n+\s*(?:marque|couleur|taille|sku)\s*:[^\n]*", re.IGNORECASE
+)
+_TRAILING_SPACES_RE = re.compile(r"[^\S\n]+$", re.MULTILINE)
+_MULTI_BLANK_RE = re.compile(r"\n{3,}")
+
+# Composition pull : "80% laine 20% nylon" -> [("80", "laine"), ("20", "nylon")]
+_FIBER_PERCENT_RE = re.compile(r"(\d+)\s*%\s*([A-Za-zÀ-ÿ]+)", re.IGNORECASE)
+_FIBER_ALIASES = {
+    "cotton": "coton",
+    "cotton.": "coton",
+    "cot": "coton",
+    "cotone": "coton",
+    "wool": "laine",
+    "lana": "laine",
+    "angora": "angora",
+    "angora rabbit": "angora",
+    "rabbit angora": "angora",
+    "rabbit": "angora",
+    "lapin": "angora",
+    "lapin angora": "angora",
+}
+
 
 # ---------------------------------------------------------------------------
 # Helpers internes
@@ -13,87 +103,96 @@ logger = logging.getLogger(__name__)
 
 
 def _safe_clean(value: Optional[Any]) -> str:
+    if value is None:
+        return ""
+    # Chemin rapide : la grande majorité des features sont déjà des str
+    if type(value) is str:
+        return value.strip()
     try:
-        if value is None:
-            return ""
-        text = str(value).strip()
-        return text
+        return str(value).strip()
     except Exception as exc:  # pragma: no cover - defensive
         logger.error("_safe_clean: erreur sur %r -> %s", value, exc)
         return ""
 
 
 def _format_percent(value: Optional[Any]) -> Optional[int]:
+    if value is None or value == "":
+        return None
+    # Chemin rapide : valeurs numériques issues du JSON IA
+    value_type = type(value)
+    if value_type is int:
+        return value
     try:
-        if value is None or value == "":
-            return None
+        if value_type is float:
+            return int(value)
         return int(float(value))
-    except Exception as exc:  # pragma: no cover - defensive
+    except (TypeError, ValueError, OverflowError) as exc:
         logger.warning("_format_percent: conversion impossible pour %r (%s)", value, exc)
         return None
 
 
 def _format_rise_label(rise_type: Optional[str], rise_cm: Optional[Any]) -> str:
-    try:
-        if rise_type:
-            normalized = rise_type.strip().lower()
-        else:
-            normalized = ""
-
-        if normalized in {"low", "ultra_low"} or "basse" in normalized:
-            return "taille basse"
-        if normalized == "high" or "haute" in normalized:
-            return "taille haute"
-        if normalized == "mid" or "moy" in normalized:
-            return "taille moyenne"
-
-        if rise_cm is not None:
-            try:
-                value = float(rise_cm)
-                if value < 23:
-                    return "taille basse"
-                if value >= 26:
-                    return "taille haute"
-                return "taille moyenne"
-            except (TypeError, ValueError):
-                logger.debug("_format_rise_label: rise_cm non exploitable: %r", rise_cm)
-
-        return "taille moyenne"
-    except Exception as exc:  # pragma: no cover - defensive
-        logger.error("_format_rise_label: erreur inattendue %s", exc)
-        return "taille moyenne"
+    normalized = _safe_clean(rise_type).lower()
+
+    if normalized in _RISE_LOW_TYPES or "basse" in normalized:
+        return _RISE_LOW
+    if normalized == "high" or "haute" in normalized:
+        return _RISE_HIGH
+    if normalized == "mid" or "moy" in normalized:
+        return _RISE_MID
+
+    if rise_cm is not None:
+        try:
+            value = float(rise_cm)
+            if value < 23:
+                return _RISE_LOW
+            if value >= 26:
+                return _RISE_HIGH
+            return _RISE_MID
+        except (TypeError, ValueError):
+            logger.debug("_format_rise_label: rise_cm non exploitable: %r", rise_cm)
+
+    return _RISE_MID
 
 
 def _build_composition(cotton_percent: Optional[Any], elasthane_percent: Optional[Any]) -> str:
-    try:
-        cotton_val = _format_percent(cotton_percent)
-        elas_val = _format_percent(elasthane_percent)
+    cotton_val = _format_percent(cotton_percent)
+    elas_val = _format_percent(elasthane_percent)
 
-        fibers: List[str] = []
-        if cotton_val is not None:
-            fibers.append(f"{cotton_val}% coton")
-        if elas_val is not None:
-            fibers.append(f"{elas_val}% élasthanne")
+    fibers: List[str] = []
+    if cotton_val is not None:
+        fibers.append(f"{cotton_val}% coton")
+    if elas_val is not None:
+        fibers.append(f"{elas_val}% élasthanne")
 
-        if fibers:
-            return "Composition : " + " et ".join(fibers) + "."
-        return "Composition non lisible (voir étiquettes en photo)."
-    except Exception as exc:  # pragma: no cover - defensive
-        logger.error("_build_composition: erreur %s", exc)
-        return "Composition non lisible (voir étiquettes en photo)."
+    if fibers:
+        return "Composition : " + " et ".join(fibers) + "."
+    return _COMPOSITION_UNREADABLE
 
 
 def _build_state_sentence(defects: Optional[str]) -> str:
-    try:
-        clean_defects = _normalize_defects(defects)
-        if not clean_defects:
-            return "Très bon état."
-        concise_state = f"Très bon état : {clean_defects} (voir photos)."
-        logger.info("_build_state_sentence: état décrit = %s", concise_state)
-        return concise_state
-    except Exception as exc:  # pragma: no cover - defensive
-        logger.error("_build_state_sentence: erreur %s", exc)
-        return "État non précisé (voir photos)."
+    clean_defects = _normalize_defects(defects)
+    if not clean_defects:
+        return _STATE_GOOD
+    concise_state = f"Très bon état : {clean_defects} (voir photos)."
+    logger.info("_build_state_sentence: état décrit = %s", concise_state)
+    return concise_state
+
+
+def _strip_leading(prefix: str, value: str) -> str:
+    """Minuscule + retire le préfixe de taille ("W28" -> "28", "L32" -> "32")."""
+    lowered = value.lower()
+    return lowered[1:] if lowered.startswith(prefix) else lowered
+
+
+def _classify_fit(
+    text: str, rules: Tuple[Tuple[Any, str, str], ...] = _FIT_RULES
+) -> Tuple[Optional[str], Optional[str]]:
+    """Renvoie (libellé, token hashtag) de la première règle de coupe qui matche."""
+    for pattern, label, tag in rules:
+        if pattern.search(text):
+            return label, tag
+    return None, None
 
 
 def _build_hashtags(
@@ -107,13 +206,21 @@ def _build_hashtags(
     gender: str,
     rise_label: str,
     durin_tag: str,
+    model_lower: Optional[str] = None,
+    color_lower: Optional[str] = None,
+    size_fr_lower: Optional[str] = None,
 ) -> str:
+    """
+    Les variantes *_lower, si fournies par l'appelant, évitent de
+    re-minusculer les mêmes champs.
+    """
     try:
-        tokens: List[str] = []
+        # dict utilisé comme ensemble ordonné (ordre d'insertion conservé)
+        tokens: Dict[str, None] = {}
 
         def add(token: str) -> None:
-            if token and token not in tokens:
-                tokens.append(token)
+            if token:
+                tokens.setdefault(token, None)
 
         brand_token = brand.lower().replace("'", "") if brand else "levis"
         add(f"#{brand_token}")
@@ -121,32 +228,26 @@ def _build_hashtags(
         add("#jeandenim")
 
         if gender:
-            gender_token = gender.lower().replace(" ", "")
+            gender_token = gender.lower().translate(_SPACE_TRANS)
             add(f"#levis{gender_token}")
 
         if model:
-            model_low = model.lower().strip()
+            model_low = model_lower if model_lower is not None else model.lower().strip()
             model_number = ""
-            try:
-                import re  # local import pour rester défensif
-
-                match = re.search(r"(\d{3})", model_low)
-                if match:
-                    model_number = match.group(1)
-            except Exception as exc:  # pragma: no cover - defensive
-                logger.warning("_build_hashtags: extraction modèle échouée (%s)", exc)
+            match = _MODEL_NUMBER_RE.search(model_low)
+            if match:
+                model_number = match.group(1)
 
             if model_number:
                 add(f"#levis{model_number}")
                 add(f"#{model_number}")
 
             model_tokens: List[str] = []
-            drop_markers = {"demi", "curve", "curvy", "cut"}
             for token in model_low.replace("/", " ").split():
-                token_clean = token.replace("'", "").replace("-", "")
+                token_clean = token.translate(_HASHTAG_TRANS)
                 if token_clean == model_number or token_clean.isdigit():
                     continue
-                if token_clean in drop_markers:
+                if token_clean in _MODEL_DROP_MARKERS:
                     logger.debug(
                         "_build_hashtags: token modèle ignoré (marker): %s", token
                     )
@@ -154,16 +255,14 @@ def _build_hashtags(
                 if token_clean:
                     model_tokens.append(token_clean)
 
-            try:
-                tokens_lower = {t.lower() for t in model_tokens}
-                if "super" in tokens_lower and "skinny" in tokens_lower:
-                    add("#superskinny")
-                    model_tokens = [t for t in model_tokens if t.lower() not in {"super", "skinny"}]
-                if "super" in tokens_lower and "slim" in tokens_lower:
-                    add("#superslim")
-                    model_tokens = [t for t in model_tokens if t.lower() not in {"super", "slim"}]
-            except Exception as exc:  # pragma: no cover - defensive
-                logger.debug("_build_hashtags: combinaison tokens modèle impossible (%s)", exc)
+            # model_tokens vient de model_low : déjà en minuscules
+            tokens_lower = frozenset(model_tokens)
+            if _SUPER_SKINNY <= tokens_lower:
+                add("#superskinny")
+                model_tokens = [t for t in model_tokens if t not in _SUPER_SKINNY]
+            if _SUPER_SLIM <= tokens_lower:
+                add("#superslim")
+                model_tokens = [t for t in model_tokens if t not in _SUPER_SLIM]
 
             for token_clean in model_tokens:
                 add(f"#{token_clean}")
@@ -171,31 +270,26 @@ def _build_hashtags(
         if fit:
             fit_low = fit.lower().strip()
             fit_key = fit_low.replace("é", "e")
-            boot_markers = {"bootcut", "boot cut", "boot-cut", "flare", "curve", "curvy"}
-            if any(marker in fit_key for marker in boot_markers):
-                fit_token = "bootcut"
-            elif "skinny" in fit_key or "slim" in fit_key:
-                fit_token = "skinny"
-            elif "straight" in fit_key or "droit" in fit_key:
-                fit_token = "straightdroit"
-            else:
-                fit_token = fit_key.replace(" ", "").replace("/", "")
+            _, fit_tag = _classify_fit(fit_key, _FIT_HASHTAG_RULES)
+            fit_token = fit_tag or fit_key.translate(_FIT_TOKEN_TRANS)
             add(f"#{fit_token}jean")
 
         if color:
-            color_clean = color.lower().replace(" ", "")
+            color_clean = (color_lower if color_lower is not None else color.lower()).translate(
+                _SPACE_TRANS
+            )
             add(f"#jean{color_clean}")
 
-        rise_clean = rise_label.lower().replace(" ", "") if rise_label else ""
+        rise_clean = rise_label.lower().translate(_SPACE_TRANS) if rise_label else ""
         if rise_clean:
             add(f"#{rise_clean}")
 
         if size_fr:
-            add(f"#fr{size_fr.lower()}")
+            add(f"#fr{size_fr_lower if size_fr_lower is not None else size_fr.lower()}")
         if size_us:
-            add(f"#w{size_us.lower().replace('w', '')}")
+            add(f"#w{_strip_leading('w', size_us)}")
         if length:
-            add(f"#l{length.lower().replace('l', '')}")
+            add(f"#l{_strip_leading('l', length)}")
 
         if durin_tag:
             add(durin_tag)
@@ -207,23 +301,18 @@ def _build_hashtags(
 
 
 def _normalize_defects(defects: Optional[str]) -> str:
-    try:
-        base = _safe_clean(defects)
-        if not base:
-            return ""
+    base = _safe_clean(defects)
+    if not base:
+        return ""
 
-        lowered = base.lower()
-        if "voir photos" in lowered:
-            cut = lowered.split("voir photos", 1)[0].strip()
-        else:
-            cut = base.strip()
+    # Recherche insensible à la casse sur le texte d'origine : l'index vaut
+    # toujours pour base, dont la casse est conservée
+    match = _VOIR_PHOTOS_RE.search(base)
+    cut = base[: match.start()] if match else base
 
-        cleaned = cut.rstrip(". ,;")
-        softened = _soften_defect_terms(cleaned)
-        return softened
-    except Exception as exc:  # pragma: no cover - defensive
-        logger.error("_normalize_defects: erreur %s", exc)
-        return ""
+    cleaned = cut.strip().rstrip(". ,;")
+    softened = _soften_defect_terms(cleaned)
+    return softened
 
 
 def _soften_defect_terms(defects: str) -> str:
@@ -264,71 +353,16 @@ def _normalize_pull_size(size: Optional[str]) -> str:
 
 
 def _strip_footer_lines(description: str) -> str:
-    try:
-        if not description:
-            return ""
-
-        try:
-            description = description.replace("\u00A0", " ")
-        except Exception as exc:  # pragma: no cover - defensive
-            logger.debug("_strip_footer_lines: normalisation espaces ignorée (%s)", exc)
-
-        filtered_lines: List[str] = []
-        for line in description.split("\n"):
-            lowered = line.strip().lower()
-            try:
-                import re
-
-                if re.match(r"^[#*\-\s]*marque\s*:", lowered):
-                    logger.debug("_strip_footer_lines: ligne marque supprimée: %s", line)
-                    continue
-                if re.match(r"^[#*\-\s]*couleur\s*:", lowered):
-                    logger.debug("_strip_footer_lines: ligne couleur supprimée: %s", line)
-                    continue
-                if re.match(r"^[#*\-\s]*taille\s*:", lowered):
-                    logger.debug("_strip_footer_lines: ligne taille supprimée: %s", line)
-                    continue
-                if re.match(r"^[#*\-\s]*sku", lowered):
-                    logger.debug("_strip_footer_lines: ligne SKU supprimée: %s", line)
-                    continue
-            except Exception as exc:  # pragma: no cover - defensive
-                logger.warning("_strip_footer_lines: regex footer ignoré (%s)", exc)
-
-            filtered_lines.append(line)
-
-        cleaned = "\n".join(filtered_lines)
-
-        try:
-            import re
-
-            cleaned = re.sub(
-                r"(?im)^\s*(marque|couleur|taille|sku)\s*:[^\n]*$",
-                "",
-                cleaned,
-            )
-            cleaned = re.sub(
-                r"(?is)\n+\s*(marque|couleur|taille|sku)\s*:[^\n]*", "", cleaned
-            )
-
-            final_lines: List[str] = []
-            blank_seen = False
-            for raw_line in cleaned.split("\n"):
-                if not raw_line.strip():
-                    if not blank_seen:
-                        final_lines.append("")
-                        blank_seen = True
-                    continue
-                final_lines.append(raw_line.rstrip())
-                blank_seen = False
-
-            cleaned = "\n".join(final_lines).strip()
-        except Exception as exc:  # pragma: no cover - defensive
-            logger.warning("_strip_footer_lines: nettoyage étendu ignoré (%s)", exc)
+    if not description:
+        return ""
 
-        return cleaned
-    except Exception as exc:  # pragma: no cover - defensive
-        logger.error("_strip_footer_lines: erreur %s", exc)
-        return description
+    cleaned = description.replace("\u00A0", " ")
+    cleaned = _FOOTER_RE.sub("", cleaned)
+    cleaned = _FOOTER_SPAN_RE.sub("", cleaned)
+    cleaned = _FOOTER_TAIL_RE.sub("", cleaned)
+    cleaned = _TRAILING_SPACES_RE.sub("", cleaned)
+    cleaned = _MULTI_BLANK_RE.sub("\n\n", cleaned)
+    return cleaned.strip()
 
 
 def _build_pull_tommy_composition(
@@ -337,150 +371,153 @@ def _build_pull_tommy_composition(
     wool_percent: Optional[Any],
     angora_percent: Optional[Any] = None,
 ) -> str:
-    try:
-        fibers: List[str] = []
-        seen: set[str] = set()
-
-        def _normalize_fiber_label(raw_label: str) -> str:
-            try:
-                aliases = {
-                    "cotton": "coton",
-                    "cotton.": "coton",
-                    "cot": "coton",
-                    "cotone": "coton",
-                    "wool": "laine",
-                    "lana": "laine",
-                    "angora": "angora",
-                    "angora rabbit": "angora",
-                    "rabbit angora": "angora",
-                    "rabbit": "angora",
-                    "lapin": "angora",
-                    "lapin angora": "angora",
-                }
-                cleaned = raw_label.strip(" .")
-                cleaned_lower = cleaned.lower()
-                return aliases.get(cleaned_lower, cleaned_lower)
-            except Exception as exc:  # pragma: no cover - defensive
-                logger.debug(
-                    "_build_pull_tommy_composition: normalisation matière échouée (%s)",
-                    exc,
-                )
-                return raw_label
-
-        def _add_fiber(label: str, percent: Optional[int]) -> None:
-            try:
-                label_clean = _safe_clean(label).lower()
-                if not label_clean:
-                    return
-                normalized_label = _normalize_fiber_label(label_clean)
-                key = (
-                    f"{percent}-{normalized_label}"
-                    if percent is not None
-                    else normalized_label
-                )
-                if key in seen:
-                    return
-                seen.add(key)
-                display = normalized_label.capitalize()
-                if percent is not None:
-                    fibers.append(f"{percent}% {display}")
-                else:
-                    fibers.append(display)
-            except Exception as exc:  # pragma: no cover - defensive
-                logger.debug(
-                    "_build_pull_tommy_composition: impossible d'ajouter %s (%s)",
-                    label,
-                    exc,
-                )
+    fibers: List[str] = []
+    seen: set[str] = set()
+
+    def _add_fiber(label: str, percent: Optional[int]) -> None:
+        label_clean = _safe_clean(label).lower()
+        if not label_clean:
+            return
+        normalized_label = label_clean.strip(" .")
+        normalized_label = _FIBER_ALIASES.get(normalized_label, normalized_label)
+        key = f"{percent}-{normalized_label}" if percent is not None else normalized_label
+        if key in seen:
+            return
+        seen.add(key)
+        display = normalized_label.capitalize()
+        if percent is not None:
+            fibers.append(f"{percent}% {display}")
+        else:
+            fibers.append(display)
+
+    clean_material = _safe_clean(material)
+    material_lower = clean_material.lower()
+    if clean_material:
+        for percent_txt, fiber_name in _FIBER_PERCENT_RE.findall(clean_material):
+            _add_fiber(fiber_name, _format_percent(percent_txt))
+
+    cotton_val = _format_percent(cotton_percent)
+    wool_val = _format_percent(wool_percent)
+    angora_val = _format_percent(angora_percent)
+
+    if cotton_val is not None:
+        _add_fiber("coton", cotton_val)
+
+    if angora_val is not None:
+        _add_fiber("angora", angora_val)
+    elif wool_val is not None:
+        if "angora" in material_lower and "laine" not in material_lower:
+            logger.info(
+                "_build_pull_tommy_composition: wool_percent traité comme angora (material=%s)",
+                clean_material,
+            )
+            _add_fiber("angora", wool_val)
+        else:
+            _add_fiber("laine", wool_val)
 
-        clean_material = _safe_clean(material)
-        material_lower = clean_material.lower()
-        if clean_material:
-            try:
-                import re
+    if fibers:
+        return "Composition : " + ", ".join(fibers) + "."
 
-                matches = re.findall(
-                    r"(\d+)\s*%\s*([A-Za-zÀ-ÿ]+)", clean_material, flags=re.IGNORECASE
-                )
-                for percent_txt, fiber_name in matches:
-                    percent_val = _format_percent(percent_txt)
-                    _add_fiber(fiber_name, percent_val)
-            except Exception as exc:  # pragma: no cover - defensive
-                logger.warning(
-                    "_build_pull_tommy_composition: parsing partiel de la composition (%s)",
-                    exc,
-                )
+    if clean_material:
+        return f"Composition (étiquette) : {clean_material}."
 
-        cotton_val = _format_percent(cotton_percent)
-        wool_val = _format_percent(wool_percent)
-        angora_val = _format_percent(angora_percent)
+    return "Composition non lisible (voir photos)."
 
-        if cotton_val is not None:
-            _add_fiber("coton", cotton_val)
 
-        if angora_val is not None:
-            _add_fiber("angora", angora_val)
-        elif wool_val is not None:
-            try:
-                if "angora" in material_lower and "laine" not in material_lower:
-                    logger.info(
-                        "_build_pull_tommy_composition: wool_percent traité comme angora (material=%s)",
-                        clean_material,
-                    )
-                    _add_fiber("angora", wool_val)
-                else:
-                    _add_fiber("laine", wool_val)
-            except Exception as exc:  # pragma: no cover - defensive
-                logger.debug(
-                    "_build_pull_tommy_composition: impossible d'interpréter wool_percent (%s)",
-                    exc,
-                )
-                _add_fiber("laine", wool_val)
+def _normalize_fit_display(raw_fit: Optional[str], model_hint: Optional[str] = None) -> str:
+    if not raw_fit and not model_hint:
+        return _FIT_UNKNOWN
 
-        if fibers:
-            return "Composition : " + ", ".join(fibers) + "."
+    value = (raw_fit or model_hint or "").strip()
+    low = value.lower()
+    secondary_low = (model_hint or "").strip().lower()
 
-        if clean_material:
-            return f"Composition (étiquette) : {clean_material}."
+    label, _ = _classify_fit(low)
+    # Un indice "bootcut" dans le modèle l'emporte sur skinny/straight
+    if label is not _FIT_BOOTCUT and _BOOT_RE.search(secondary_low):
+        return _FIT_BOOTCUT
 
-        return "Composition non lisible (voir photos)."
-    except Exception as exc:  # pragma: no cover - defensive
-        logger.error("_build_pull_tommy_composition: erreur %s", exc)
-        return "Composition non lisible (voir photos)."
+    return label or value or _FIT_UNKNOWN
 
 
-def _normalize_fit_display(raw_fit: Optional[str], model_hint: Optional[str] = None) -> str:
-    try:
-        if not raw_fit and not model_hint:
-            return "coupe non précisée"
-
-        value = (raw_fit or model_hint or "").strip()
-        low = value.lower()
-        secondary_low = (model_hint or "").strip().lower()
-
-        boot_markers = (
-            "boot",
-            "flare",
-            "évas",
-            "evase",
-            "curve",
-            "curvy",
+# ---------------------------------------------------------------------------
+# Features nettoyés (partagés par les builders)
+# ---------------------------------------------------------------------------
+
+
+@dataclass(frozen=True, slots=True)
+class CleanedFeatures:
+    """
+    Vue nettoyée (une seule passe de _safe_clean) d'un dict de features.
+
+    Les champs texte sont déjà strippés ("" si absents) ; les valeurs
+    numériques (pourcentages, rise_cm) et rise_type restent brutes, leur
+    interprétation étant faite par les helpers dédiés. Immuable et hashable :
+    sert directement de clé de cache pour les descriptions.
+    """
+
+    brand: str = ""
+    model: str = ""
+    fit: str = ""
+    color: str = ""
+    size_fr: str = ""
+    size_us: str = ""
+    length: str = ""
+    gender: str = ""
+    garment_type: str = ""
+    neckline: str = ""
+    pattern: str = ""
+    material: str = ""
+    size: str = ""
+    size_source: str = ""
+    measurement_mode: str = ""
+    defects: str = ""
+    rise_type: Optional[Any] = None
+    rise_cm: Optional[Any] = None
+    cotton_percent: Optional[Any] = None
+    elasthane_percent: Optional[Any] = None
+    wool_percent: Optional[Any] = None
+    angora_percent: Optional[Any] = None
+    main_colors: Optional[Any] = None
+
+    @classmethod
+    def from_features(cls, features: Dict[str, Any]) -> "CleanedFeatures":
+        """Nettoie une fois toutes les clés utilisées par les builders."""
+        colors = features.get("main_colors")
+        return cls(
+            brand=_safe_clean(features.get("brand")),
+            model=_safe_clean(features.get("model")),
+            fit=_safe_clean(features.get("fit")),
+            color=_safe_clean(features.get("color")),
+            size_fr=_safe_clean(features.get("size_fr")),
+            size_us=_safe_clean(features.get("size_us")),
+            length=_safe_clean(features.get("length")),
+            gender=_safe_clean(features.get("gender")),
+            garment_type=_safe_clean(features.get("garment_type")),
+            neckline=_safe_clean(features.get("neckline")),
+            pattern=_safe_clean(features.get("pattern")),
+            material=_safe_clean(features.get("material")),
+            size=_safe_clean(features.get("size")),
+            size_source=_safe_clean(features.get("size_source")),
+            measurement_mode=_safe_clean(features.get("measurement_mode")),
+            defects=_safe_clean(features.get("defects")),
+            rise_type=features.get("rise_type"),
+            rise_cm=features.get("rise_cm"),
+            cotton_percent=features.get("cotton_percent"),
+            elasthane_percent=features.get("elasthane_percent"),
+            wool_percent=features.get("wool_percent"),
+            angora_percent=features.get("angora_percent"),
+            main_colors=tuple(colors) if isinstance(colors, list) else colors,
         )
-        if any(marker in low for marker in boot_markers) or any(
-            marker in secondary_low for marker in boot_markers
-        ):
-            return "Bootcut/Évasé"
 
-        if "skinny" in low or "slim" in low:
-            return "Skinny"
 
-        if "straight" in low or "droit" in low:
-            return "Straight/Droit"
+FeaturesInput = Union[Dict[str, Any], CleanedFeatures]
 
-        return value or "coupe non précisée"
-    except Exception as exc:  # pragma: no cover - defensive
-        logger.error("_normalize_fit_display: erreur %s", exc)
-        return "coupe non précisée"
+
+def _as_cleaned(features: FeaturesInput) -> CleanedFeatures:
+    if isinstance(features, CleanedFeatures):
+        return features
+    return CleanedFeatures.from_features(features)
 
 
 # ---------------------------------------------------------------------------
@@ -488,8 +525,8 @@ def _normalize_fit_display(raw_fit: Optional[str], model_hint: Optional[str] = N
 # ---------------------------------------------------------------------------
 
 
-def build_jean_levis_description(
-    features: Dict[str, Any],
+def _build_jean_levis_description(
+    features: FeaturesInput,
     ai_description: Optional[str] = None,
     ai_defects: Optional[str] = None,
 ) -> str:
@@ -498,19 +535,20 @@ def build_jean_levis_description(
     normalisés. En cas d'erreur, on retombe sur la description IA brute.
     """
     try:
-        logger.info("build_jean_levis_description: features reçus = %s", features)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("build_jean_levis_description: features reçus = %s", features)
 
-        brand = _safe_clean(features.get("brand")) or "Levi's"
-        model = _safe_clean(features.get("model"))
-        raw_fit = _safe_clean(features.get("fit"))
+        feats = _as_cleaned(features)
+        brand = feats.brand or "Levi's"
+        model = feats.model
+        raw_fit = feats.fit
         fit = _normalize_fit_display(raw_fit, model_hint=model)
-        color = _safe_clean(features.get("color"))
-        size_fr = _safe_clean(features.get("size_fr"))
-        size_us = _safe_clean(features.get("size_us"))
-        length = _safe_clean(features.get("length"))
-        gender = _safe_clean(features.get("gender")) or "femme"
-        sku = _safe_clean(features.get("sku"))
-        rise_label = _format_rise_label(features.get("rise_type"), features.get("rise_cm"))
+        color = feats.color
+        size_fr = feats.size_fr
+        size_us = feats.size_us
+        length = feats.length
+        gender = feats.gender or "femme"
+        rise_label = _format_rise_label(feats.rise_type, feats.rise_cm)
 
         title_intro_parts = ["Jean", brand]
         if model:
@@ -520,27 +558,29 @@ def build_jean_levis_description(
         # --- Phrases structurées ------------------------------------------
         intro_sentence = f"{title_intro} pour {gender}."
 
-        size_sentence_parts = []
         if size_us and size_fr:
-            size_sentence_parts.append(
-                f"Taille {size_us} US (équivalent {size_fr} FR)"
-            )
+            size_head = f"Taille {size_us} US (équivalent {size_fr} FR), "
         elif size_fr:
-            size_sentence_parts.append(f"Taille {size_fr} FR")
+            size_head = f"Taille {size_fr} FR, "
         elif size_us:
-            size_sentence_parts.append(f"Taille {size_us} US")
-        if fit:
-            size_sentence_parts.append(f"coupe {fit}")
-        if rise_label:
-            size_sentence_parts.append(f"à {rise_label}")
-        if size_sentence_parts:
-            size_sentence_parts.append(
-                "pour une silhouette ajustée et confortable"
-            )
-        size_sentence = ", ".join(size_sentence_parts).strip()
-        size_sentence = f"{size_sentence}." if size_sentence else "Taille non précisée."
+            size_head = f"Taille {size_us} US, "
+        else:
+            size_head = ""
+        fit_part = f"coupe {fit}, " if fit else ""
+        rise_part = f"à {rise_label}, " if rise_label else ""
+        size_prefix = f"{size_head}{fit_part}{rise_part}"
+        size_sentence = (
+            f"{size_prefix}pour une silhouette ajustée et confortable."
+            if size_prefix
+            else "Taille non précisée."
+        )
 
-        color_has_fade = "lavé" in color.lower() if color else False
+        # Minuscules calculées une fois, réutilisées par les hashtags
+        model_lower = model.lower()
+        color_lower = color.lower()
+        size_fr_lower = size_fr.lower()
+
+        color_has_fade = "lavé" in color_lower
         if color:
             nuance = " légèrement délavé" if not color_has_fade else ""
             color_sentence = (
@@ -549,10 +589,10 @@ def build_jean_levis_description(
         else:
             color_sentence = "Coloris non précisé, se référer aux photos pour les nuances."
         composition_sentence = _build_composition(
-            features.get("cotton_percent"), features.get("elasthane_percent")
+            feats.cotton_percent, feats.elasthane_percent
         )
         closure_sentence = "Fermeture zippée + bouton gravé Levi’s."
-        state_sentence = _build_state_sentence(ai_defects or features.get("defects"))
+        state_sentence = _build_state_sentence(ai_defects or feats.defects)
 
         logistics_sentence = "📏 Mesures visibles en photo."
         shipping_sentence = "📦 Envoi rapide et soigné"
@@ -560,7 +600,7 @@ def build_jean_levis_description(
         cta_lot_sentence = (
             "💡 Pensez à un lot pour profiter d’une réduction supplémentaire et économiser des frais d’envoi !"
         )
-        durin_tag = f"#durin31fr{(size_fr or 'nc').lower()}"
+        durin_tag = f"#durin31fr{size_fr_lower or 'nc'}"
         cta_durin_sentence = (
             f"✨ Retrouvez tous mes articles Levi’s à votre taille ici 👉 {durin_tag}"
         )
@@ -576,6 +616,9 @@ def build_jean_levis_description(
             gender=gender,
             rise_label=rise_label,
             durin_tag=durin_tag,
+            model_lower=model_lower,
+            color_lower=color_lower,
+            size_fr_lower=size_fr_lower,
         )
 
         paragraphs = [
@@ -592,9 +635,11 @@ def build_jean_levis_description(
             hashtags,
         ]
 
-        description = "\n\n".join(part for part in paragraphs if part)
-        description = _strip_footer_lines(description)
-        logger.debug("build_jean_levis_description: description générée = %s", description)
+        # Paragraphes vides écartés ; les lignes footer sont retirées par le
+        # normalizer (_strip_footer_lines), pas ici.
+        description = "\n\n".join(filter(None, paragraphs))
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("build_jean_levis_description: description générée = %s", description)
         return description
 
     except Exception as exc:  # pragma: no cover - defensive
@@ -602,33 +647,35 @@ def build_jean_levis_description(
         return _safe_clean(ai_description)
 
 
-def build_pull_tommy_description(
-    features: Dict[str, Any],
+def _build_pull_tommy_description(
+    features: FeaturesInput,
     ai_description: Optional[str] = None,
     ai_defects: Optional[str] = None,
 ) -> str:
     """Construit une description structurée pour un pull Tommy Hilfiger."""
     try:
-        logger.info("build_pull_tommy_description: features reçus = %s", features)
-
-        brand = _safe_clean(features.get("brand")) or "Tommy Hilfiger"
-        garment_type = _safe_clean(features.get("garment_type")) or "pull"
-        gender = _safe_clean(features.get("gender")) or "femme"
-        neckline = _safe_clean(features.get("neckline"))
-        pattern = _safe_clean(features.get("pattern"))
-        material = _safe_clean(features.get("material"))
-        cotton_percent = features.get("cotton_percent")
-        wool_percent = features.get("wool_percent")
-        angora_percent = features.get("angora_percent")
-        colors_raw = features.get("main_colors")
-        size = _normalize_pull_size(features.get("size"))
-        size_source = (_safe_clean(features.get("size_source")) or "").lower()
-        measurement_mode = (_safe_clean(features.get("measurement_mode")) or "").lower()
-        defects = ai_defects or features.get("defects")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("build_pull_tommy_description: features reçus = %s", features)
+
+        feats = _as_cleaned(features)
+        brand = feats.brand or "Tommy Hilfiger"
+        garment_type = feats.garment_type or "pull"
+        gender = feats.gender or "femme"
+        neckline = feats.neckline
+        pattern = feats.pattern
+        material = feats.material
+        cotton_percent = feats.cotton_percent
+        wool_percent = feats.wool_percent
+        angora_percent = feats.angora_percent
+        colors_raw = feats.main_colors
+        size = _normalize_pull_size(feats.size)
+        size_source = feats.size_source.lower()
+        measurement_mode = feats.measurement_mode.lower()
+        defects = ai_defects or feats.defects
 
         colors = ""
         try:
-            if isinstance(colors_raw, list):
+            if isinstance(colors_raw, (list, tuple)):
                 colors = ", ".join([_safe_clean(c) for c in colors_raw if _safe_clean(c)])
             else:
                 colors = _safe_clean(colors_raw)
@@ -712,7 +759,7 @@ def build_pull_tommy_description(
         ]
         logistics_sentence = "\n".join(logistics_lines)
 
-        tokens_hashtag: List[str] = []
+        tokens_hashtag: Dict[str, None] = {}
         try:
             size_token = _normalize_pull_size(size).replace(" ", "") if size else "NC"
             durin_tag = f"#durin31tf{size_token}"
@@ -723,8 +770,8 @@ def build_pull_tommy_description(
 
         try:
             def _add_tag(token: str) -> None:
-                if token and token not in tokens_hashtag:
-                    tokens_hashtag.append(token)
+                if token:
+                    tokens_hashtag.setdefault(token, None)
 
             base_tags = [
                 "#tommyhilfiger",
@@ -746,7 +793,7 @@ def build_pull_tommy_description(
 
             if colors:
                 for color_token in colors.split(","):
-                    clean_color = color_token.strip().lower().replace(" ", "")
+                    clean_color = color_token.strip().lower().translate(_SPACE_TRANS)
                     if clean_color:
                         _add_tag(f"#{clean_color}")
         except Exception as exc:  # pragma: no cover - defensive
@@ -773,8 +820,63 @@ def build_pull_tommy_description(
 
         description = "\n\n".join([p for p in paragraphs if p])
         cleaned = _strip_footer_lines(description)
-        logger.debug("build_pull_tommy_description: description générée = %s", cleaned)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("build_pull_tommy_description: description générée = %s", cleaned)
         return cleaned
     except Exception as exc:  # pragma: no cover - defensive
         logger.exception("build_pull_tommy_description: fallback description IA (%s)", exc)
         return _strip_footer_lines(_safe_clean(ai_description))
+
+
+# ---------------------------------------------------------------------------
+# API publique (mémoïsée)
+# ---------------------------------------------------------------------------
+
+
+@lru_cache(maxsize=512)
+def _build_jean_levis_cached(
+    cleaned: CleanedFeatures,
+    ai_description: Optional[str],
+    ai_defects: Optional[str],
+) -> str:
+    return _build_jean_levis_description(cleaned, ai_description, ai_defects)
+
+
+@lru_cache(maxsize=512)
+def _build_pull_tommy_cached(
+    cleaned: CleanedFeatures,
+    ai_description: Optional[str],
+    ai_defects: Optional[str],
+) -> str:
+    return _build_pull_tommy_description(cleaned, ai_description, ai_defects)
+
+
+def build_jean_levis_description(
+    features: FeaturesInput,
+    ai_description: Optional[str] = None,
+    ai_defects: Optional[str] = None,
+) -> str:
+    """
+    Génère une description structurée d'un jean Levi's à partir des features
+    normalisés (dict brut ou CleanedFeatures). Le résultat est mis en cache
+    (aperçu, re-rendu, retry) ; si une valeur n'est pas hashable, on passe par
+    le chemin non mis en cache.
+    """
+    try:
+        return _build_jean_levis_cached(_as_cleaned(features), ai_description, ai_defects)
+    except (TypeError, AttributeError) as exc:
+        logger.debug("build_jean_levis_description: cache ignoré (%s)", exc)
+        return _build_jean_levis_description(features, ai_description, ai_defects)
+
+
+def build_pull_tommy_description(
+    features: FeaturesInput,
+    ai_description: Optional[str] = None,
+    ai_defects: Optional[str] = None,
+) -> str:
+    """Construit (ou relit en cache) la description d'un pull Tommy Hilfiger."""
+    try:
+        return _build_pull_tommy_cached(_as_cleaned(features), ai_description, ai_defects)
+    except (TypeError, AttributeError) as exc:
+        logger.debug("build_pull_tommy_description: cache ignoré (%s)", exc)
+        return _build_pull_tommy_description(features, ai_description, ai_defects)
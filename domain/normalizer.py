@@ -555,13 +555,13 @@ def normalize_and_postprocess(
     result: Dict[str, Any] = {}
 
     # --- 1) Construction des features selon le profil ---------------------
-    if profile_name == AnalysisProfileName.JEAN_LEVIS:
+    if profile_name is AnalysisProfileName.JEAN_LEVIS:
         features = build_features_for_jean_levis(ai_data, ui_data)
         features = normalize_sizes(features)
 
         # Titre reconstruit de manière cohérente pour TOUS les providers
         title = build_jean_levis_title(features)
-    elif profile_name == AnalysisProfileName.PULL_TOMMY:
+    elif profile_name is AnalysisProfileName.PULL_TOMMY:
         features = build_features_for_pull_tommy(ai_data, ui_data)
         title = build_pull_tommy_title(features)
     else:
@@ -573,13 +573,13 @@ def normalize_and_postprocess(
 
     # --- 2) Description ----------------------------------------------------
     try:
-        if profile_name == AnalysisProfileName.JEAN_LEVIS:
+        if profile_name is AnalysisProfileName.JEAN_LEVIS:
             description = build_jean_levis_description(
                 {**features, "defects": ai_data.get("defects")},
                 ai_description=ai_data.get("description"),
                 ai_defects=ai_data.get("defects"),
             )
-        elif profile_name == AnalysisProfileName.PULL_TOMMY:
+        elif profile_name is AnalysisProfileName.PULL_TOMMY:
             description = build_pull_tommy_description(
                 {**features, "defects": ai_data.get("defects")},
                 ai_description=ai_data.get("description"),
@@ -600,7 +600,7 @@ def normalize_and_postprocess(
             exc,
         )
         raw_description = ai_data.get("description") or ""
-        if profile_name == AnalysisProfileName.PULL_TOMMY:
+        if profile_name is AnalysisProfileName.PULL_TOMMY:
             try:
                 description = _strip_footer_lines(raw_description)
             except Exception as nested_exc:  # pragma: no cover - defensive
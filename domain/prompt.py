@@ -12,63 +12,41 @@ Ce fichier définit un seul contrat fort, réutilisé par tous les clients :
 
 from __future__ import annotations
 
+import json
+import logging
+from hashlib import blake2b
+from typing import Any, Dict, Optional, Sequence, Tuple
 
-PROMPT_CONTRACT = r"""
-You are a structured data extraction agent specializing in second-hand clothing listings for Vinted.
+from domain.templates import ALL_PROFILES, AnalysisProfile, AnalysisProfileName
 
-CONTEXT:
-- The user uploads SEVERAL images of THE SAME clothing item.
-- These images may typically include:
-  1) A photo with a SKU number written on a tag/paper (letters + digits).
-  2) One or more full-body views of the garment (front / back / general view).
-  3) One or more close-up photos of labels:
-     - brand
-     - size
-     - composition / materials
-     - care instructions
-  4) Several photos of flat measurements:
-     - chest width
-     - length
-     - sleeve length
-     - shoulder width
-     - etc.
-- All images ALWAYS refer to the SAME physical item.
-
-YOUR GOAL:
-- Carefully analyze ALL provided images.
-- Cross-check information between them (labels, global views, measurements).
-- Produce a SINGLE, coherent, honest Vinted listing for this item.
-
-EXTREME PRECISION & HONESTY (IMPORTANT):
-- You MUST be as precise and detailed as possible, but also STRICTLY honest.
-- NEVER invent information that is not clearly visible on at least one image.
-- If you are NOT SURE about something (brand, size, composition, fit, defects…):
-  - Do NOT hallucinate.
-  - Prefer to leave the corresponding JSON field as null.
-  - You MAY mention uncertainties in the description, but clearly as "probable" or "approximate".
-- When you see labels (brand / size / composition), ALWAYS trust the text on the label
-  over visual guessing.
+logger = logging.getLogger(__name__)
 
-EXAMPLES OF WHAT TO DO:
-- If you see "Tommy Hilfiger" clearly on a label → brand = "Tommy Hilfiger".
-- If you see "100% cotton" on a composition tag → mention cotton in the description.
-- If you see visible pilling, stains, pulled threads, holes, discolored areas → describe them precisely.
-- If you see a measuring tape in cm on flat measurements → you may integrate key measurements
-  in the description (e.g. "Largeur aisselle-à-aisselle: 52 cm").
 
-EXAMPLES OF WHAT NOT TO DO:
-- Do NOT invent a brand if the label is not readable.
-- Do NOT invent a size if there is no visible size tag or clear information.
-- Do NOT invent fabric composition if there is no readable label.
-- Do NOT claim "new" or "like new" if there are visible signs of wear.
-- Do NOT invent style names or model names that are not evident from logos/labels.
-
-OUTPUT FORMAT (MANDATORY):
-- The output MUST be a single JSON object.
-- The JSON MUST be syntactically valid and parseable.
-- JSON keys MUST be in ENGLISH and MUST match EXACTLY the schema below.
-- Do NOT translate keys to French.
-- Do NOT include explanations, markdown, comments, or any additional text outside the JSON.
+PROMPT_CONTRACT = r"""
+You are a structured data extraction agent for second-hand clothing listings on Vinted.
+
+CONTEXT:
+- The user uploads SEVERAL images of THE SAME physical item, typically:
+  1) a SKU number written on a tag/paper (letters + digits);
+  2) full views of the garment (front / back);
+  3) close-ups of labels: brand, size, composition, care instructions;
+  4) flat measurements: chest width, length, sleeve length, shoulder width, etc.
+- Analyze ALL images, cross-check them (labels, views, measurements) and produce
+  a SINGLE, coherent, honest listing.
+
+PRECISION & HONESTY (apply to every field):
+- Be as precise and detailed as possible, but NEVER invent anything that is not
+  clearly visible on at least one image (brand, size, composition, model, fit, defects…).
+- Label text (brand / size / composition) always wins over visual guessing.
+- If a value is not clearly visible or confidently deducible, set the field to null.
+- Uncertainty may only be expressed in the description, as "probable" / "approximate",
+  e.g. "Taille estimée à partir des mesures : probablement M."
+- Never claim "new" or "like new" when signs of wear are visible.
+
+OUTPUT FORMAT:
+- A single JSON object; keys in ENGLISH, exactly as in the schema below.
+- "title", "description" and "defects" are written in French.
+- Plain text values only: no emojis, icons or hashtags.
 
 TARGET JSON SCHEMA:
 
@@ -84,180 +62,279 @@ TARGET JSON SCHEMA:
 }
 
 FIELD SEMANTICS:
+- "title": short and clear; brand (if known) + garment type + key style/color,
+  e.g. "Pull Tommy Hilfiger rayé bleu marine - coton", "Jean Levi's 501 bleu brut".
+- "description": very detailed, structured plain text (no markdown: no bold, lists or
+  headings). Cover, when visible: garment type; brand (readable labels/logos only);
+  size (from the label, or clearly flagged as estimated from measurements); cut/style
+  (regular, slim, oversize, droit, cropped…) only if clearly visible; composition
+  (readable labels only); relevant season/usage; condition (pilling, stains, wear at
+  collar/cuffs/hem, snags, holes, pulled threads); key flat measurements if readable.
+- "brand": plain text, as printed on the label or logo (e.g. "Tommy Hilfiger", "Levi's").
+- "style": a few words (casual, streetwear, outdoor, preppy, vintage, minimal, sport…).
+- "pattern": uni, rayé, à carreaux, colorblock, fleuri, camouflage… ("uni" when plain).
+- "neckline": col rond, col V, col montant, col zippé, col cheminée, capuche…
+  (null when not applicable, e.g. trousers).
+- "season": "hiver", "mi-saison", "été", "automne", "all-season"…, based on thickness,
+  material and garment type.
+- "defects": visible defects (stains, pilling, holes, damaged seams, discoloration…);
+  "Aucun défaut majeur visible" or null when none.
+"""
 
-- "title":
-  - Language: French.
-  - Short and clear.
-  - Should ideally include: brand (if known), garment type, key style/color.
-  - Examples:
-    - "Pull Tommy Hilfiger rayé bleu marine - coton"
-    - "Polaire The North Face zippée - noir"
-    - "Jean Levi's 501 bleu brut"
-
-- "description":
-  - Language: French.
-  - Very detailed and precise.
-  - Describe, when visible:
-    - Type de vêtement (pull, polaire, jean, chemise, veste…).
-    - Marque (uniquement depuis les étiquettes / logos lisibles).
-    - Taille (depuis l’étiquette; si estimée à partir des mesures, le préciser clairement).
-    - Coupe / style (regular, slim, oversize, droit, cropped, etc.) seulement si clairement visible.
-    - Composition / matière (uniquement depuis les étiquettes lisibles: coton, polyester, laine, etc.).
-    - Usage / saison pertinente (hiver, mi-saison, outdoor, layering, etc.), si logique.
-    - Etat du vêtement:
-      - Boulochage / pilling.
-      - Taches.
-      - Usure au col, poignets, bas de manches ou bas de vêtement.
-      - Accrocs, trous, fils tirés.
-    - Mesures à plat importantes si elles sont lisibles sur les photos:
-      - Exemple: "Largeur aisselle-aisselle: 52 cm", "Longueur dos: 68 cm".
-  - La description doit être structurée et lisible, mais tu ne dois pas utiliser de markdown
-    (pas de **gras**, pas de listes markdown, pas de titres).
-
-- "brand":
-  - Nom de la marque, en texte brut, tel qu’apparaît sur l’étiquette ou le logo.
-  - Exemple: "Tommy Hilfiger", "The North Face", "Levi's".
-  - Si aucune information fiable n’est visible → null.
-
-- "style":
-  - Quelques mots en anglais ou français décrivant le style général (casual, streetwear,
-    outdoor, preppy, vintage, minimal, sport, etc.), SI c’est cohérent avec les images.
-  - Si tu n’es pas sûr → null.
-
-- "pattern":
-  - Motif du vêtement si visible: uni, rayé, à carreaux, colorblock, fleuri, camouflage, etc.
-  - Si pas de motif évident → "uni" OU null si vraiment incertain.
-
-- "neckline":
-  - Type de col si visible: col rond, col V, col montant, col zippé, col cheminée, capuche, etc.
-  - Si non applicable (ex: pantalon) ou non visible → null.
-
-- "season":
-  - Saison d’usage principale (en français ou anglais): "hiver", "mi-saison", "été",
-    "automne", "all-season", etc.
-  - Base-toi sur l’épaisseur apparente, le type de matière et le type de vêtement.
-  - Si tu n’es pas sûr → null.
-
-- "defects":
-  - Description textuelle en français des défauts visibles:
-    - taches, boulochage, trous, coutures abîmées, décolorations, etc.
-  - Si aucun défaut évident → "Aucun défaut majeur visible" OU null (si tu veux rester très prudent).
-
-RULES ABOUT UNKNOWN OR UNCERTAIN INFORMATION:
-- If a field’s value is not clearly visible or confidently deducible from the images:
-  - Set that JSON field to null.
-  - Do NOT fabricate or guess concrete values.
-- You may express uncertainty in the description, e.g.:
-  - "Taille estimée à partir des mesures: probablement M."
-  - "Composition non lisible, probablement mélange synthétique."
-  
-==============================================================
- EXTENDED OUTPUT FOR PROFILE "jean_levis"
-==============================================================
-
-If the selected analysis profile is named "jean_levis":
-
-You must include, in addition to the base JSON fields
-(title, description, brand, style, pattern, neckline, season, defects),
-a second nested object called "features".
-
-The final JSON MUST respect the following structure:
-
-{
-  "title": string,
-  "description": string,
-  "brand": string | null,
-  "style": string | null,
-  "pattern": string | null,
-  "neckline": string | null,
-  "season": string | null,
-  "defects": string | null,
-
-  "features": {
-    "brand": string | null,
-    "model": string | null,
-    "fit": string | null,
-    "color": string | null,
-
-    "size_fr": string | null,
-    "size_us": string | null,
-    "length": string | null,
-
-    "cotton_percent": number | null,
-    "elasthane_percent": number | null,
-
-    "rise_type": string | null,
-    "rise_cm": number | null,
+# Exemples à faire / ne pas faire : ajoutés seulement en mode strict
+# (ui_data["strict_mode"]), les appels courants s'en passent.
+FEW_SHOT_EXAMPLES = r"""
+EXAMPLES OF WHAT TO DO:
+- "Tommy Hilfiger" clearly on a label → brand = "Tommy Hilfiger".
+- "100% cotton" on a composition tag → mention cotton in the description.
+- Visible pilling, stains, pulled threads, holes, discolored areas → describe them precisely.
+- Measuring tape in cm on flat measurements → key measurements may go in the description
+  (e.g. "Largeur aisselle-à-aisselle : 52 cm").
 
-    "gender": string | null,
-    "sku": string | null,
-"sku_status": "ok" | "missing" | "low_confidence"
-  }
+EXAMPLES OF WHAT NOT TO DO:
+- Inventing a brand when the label is not readable.
+- Inventing a size without a visible size tag or clear information.
+- Inventing a fabric composition without a readable label.
+- Claiming "new" or "like new" despite visible signs of wear.
+- Inventing style or model names that are not evident from logos/labels.
+""".strip()
+
+# ---------------------------------------------------------------------------
+# Préfixes statiques (PROMPT_CONTRACT + prompt_suffix), calculés une fois
+# ---------------------------------------------------------------------------
+
+# Taille minimale (en tokens) d'un préfixe éligible au cache implicite
+# (OpenAI, Gemini 2.5 Flash).
+PROMPT_CACHE_MIN_TOKENS = 1024
+
+# Estimation volontairement basse (~4 caractères par token) : le texte est
+# en anglais/français avec beaucoup de ponctuation, le compte réel est plus
+# élevé. Pas de tiktoken ici : ses encodages sont téléchargés au premier
+# appel, ce qui bloquerait l'import hors ligne.
+_CHARS_PER_TOKEN = 4
+
+
+def estimate_prompt_tokens(text: str) -> int:
+    """Estimation conservatrice du nombre de tokens d'un texte."""
+    return len(text) // _CHARS_PER_TOKEN
+
+
+def _render_schema_type(spec: Dict[str, Any]) -> str:
+    if "enum" in spec:
+        return " | ".join(json.dumps(value, ensure_ascii=False) for value in spec["enum"])
+    types = spec.get("type", "string")
+    if isinstance(types, str):
+        return types
+    return " | ".join(types)
+
+
+def _render_features_block(profile: AnalysisProfile) -> str:
+    """
+    Rend l'objet "features" du json_schema du profil au format du contrat
+    (`"key": type | null,  // description`). Chaque profil ne transporte
+    ainsi que sa propre extension, au lieu de celles de tous les profils.
+    """
+    features = profile.json_schema.get("properties", {}).get("features")
+    if not features:
+        return ""
+
+    properties = list(features.get("properties", {}).items())
+    lines = []
+    for index, (key, spec) in enumerate(properties):
+        line = f'    "{key}": {_render_schema_type(spec)}'
+        if index < len(properties) - 1:
+            line += ","
+        if spec.get("description"):
+            line += f"  // {spec['description']}"
+        lines.append(line)
+
+    return (
+        "==============================================================\n"
+        f' EXTENDED OUTPUT FOR PROFILE "{profile.name.value}"\n'
+        "==============================================================\n\n"
+        'Add to the base fields above a nested "features" object:\n\n'
+        '  "features": {\n' + "\n".join(lines) + "\n  }"
+    )
+
+
+def _join_static_prefix(profile: AnalysisProfile) -> str:
+    blocks = (PROMPT_CONTRACT, _render_features_block(profile), profile.prompt_suffix)
+    return "\n\n".join(block for block in blocks if block)
+
+
+# PROMPT_CONTRACT et les prompt_suffix sont des constantes : on concatène une
+# seule fois par profil au lieu de réallouer plusieurs Ko à chaque appel.
+_STATIC_PREFIXES: Dict[AnalysisProfileName, str] = {
+    name: _join_static_prefix(profile) for name, profile in ALL_PROFILES.items()
 }
 
-Rules:
-- NEVER invent information.
-- If a field is not visible on a label or obvious from photos, set null.
-- If the SKU tag is unreadable or absent, set sku_status="missing".
-- If fit is ambiguous, leave it null.
-- If the model number (501, 505, 511, 514, 550…) is visible on a label, put it there.
-- Do NOT guess model numbers or fabric percentages.
-
 
-JSON ONLY:
-- Your final answer MUST be ONLY the JSON object.
-- No surrounding text, no explanations, no markdown.
+def _hash_prefix(prefix: str) -> str:
+    return blake2b(prefix.encode("utf-8"), digest_size=16).hexdigest()
 
-==============================================================
- EXTENDED OUTPUT FOR PROFILE "pull_tommy"
-==============================================================
 
-If the selected analysis profile is named "pull_tommy":
-
-You must include, in addition to the base JSON fields
-(title, description, brand, style, pattern, neckline, season, defects),
-a second nested object called "features" describing the sweater.
+# Taille estimée et empreinte de chaque préfixe, calculées une fois : à
+# l'appel, seule la queue dynamique reste à estimer.
+_PREFIX_TOKENS: Dict[AnalysisProfileName, int] = {
+    name: estimate_prompt_tokens(prefix) for name, prefix in _STATIC_PREFIXES.items()
+}
+_PREFIX_HASHES: Dict[AnalysisProfileName, str] = {
+    name: _hash_prefix(prefix) for name, prefix in _STATIC_PREFIXES.items()
+}
 
-The final JSON MUST respect the following structure:
 
-{
-  "title": string,
-  "description": string,
-  "brand": string | null,
-  "style": string | null,
-  "pattern": string | null,
-  "neckline": string | null,
-  "season": string | null,
-  "defects": string | null,
-
-  "features": {
-    "brand": string | null,
-    "garment_type": string | null,       // "pull", "gilet", "cardigan" or similar
-    "neckline": string | null,           // col rond, col V, col zippé/ montant, col roulé
-    "pattern": string | null,            // uni, torsadé, rayé, colorblock, etc.
-    "main_colors": array | null,         // list of key colors seen (e.g. ["bleu", "blanc", "rouge"])
-    "material": string | null,           // raw material text from the composition label (e.g. "100% coton", "80% laine 20% nylon")
-    "cotton_percent": number | null,
-    "wool_percent": number | null,
-    "gender": string | null,             // homme / femme / unisexe if visible
-    "size": string | null,               // tag size from the label (e.g. S, M, L, XL, XXL...)
-    "size_estimated": string | null,     // ONLY when measurement_mode="mesures" and no label is readable
-    "size_source": "label" | "estimated" | null,  // origin of the size value
-    "sku": string | null,
-    "sku_status": "ok" | "missing" | "low_confidence"
-  }
+def _static_prefix(profile: AnalysisProfile) -> str:
+    """
+    Préfixe statique précalculé du profil. Un profil construit à la main
+    (absent de ALL_PROFILES) est concaténé à la volée.
+    """
+    if ALL_PROFILES.get(profile.name) is profile:
+        return _STATIC_PREFIXES[profile.name]
+    return _join_static_prefix(profile)
+
+
+def _check_cacheable_prefixes() -> None:
+    """
+    Vérifie une fois, à l'import, que le préfixe statique de chaque profil
+    dépasse PROMPT_CACHE_MIN_TOKENS. En dessous, le cache du provider ne
+    s'applique pas et chaque appel repaie tout le contrat.
+    """
+    for name, estimated in _PREFIX_TOKENS.items():
+        if estimated < PROMPT_CACHE_MIN_TOKENS:
+            logger.warning(
+                "Préfixe statique trop court pour le cache (%s) : ~%d tokens < %d.",
+                name.value,
+                estimated,
+                PROMPT_CACHE_MIN_TOKENS,
+            )
+
+
+# ---------------------------------------------------------------------------
+# Assemblage du prompt complet (préfixe statique + consignes dynamiques)
+# ---------------------------------------------------------------------------
+
+
+def _build_measurement_instruction(measurement_mode: Optional[str]) -> str:
+    if not measurement_mode:
+        return ""
+    return (
+        f"Mode de relevé UI : {measurement_mode}. "
+        "Si measurement_mode=mesures, estime la taille depuis les mesures à plat "
+        "quand aucune étiquette n'est lisible, sans inventer ni lister les mesures."
+    )
+
+
+def _build_dynamic_blocks(measurement_mode: Optional[str], strict_mode: bool) -> Tuple[str, ...]:
+    dynamic = (
+        FEW_SHOT_EXAMPLES if strict_mode else "",
+        _build_measurement_instruction(measurement_mode),
+    )
+    return tuple(block for block in dynamic if block)
+
+
+# Valeurs de measurement_mode envoyées par l'UI (None = non renseigné).
+_MEASUREMENT_MODES = (None, "etiquette", "mesures")
+
+# Queues dynamiques possibles (measurement_mode x strict_mode), figées à
+# l'import : plus de liste ni de conditions à chaque appel.
+_DYNAMIC_BLOCKS: Dict[Tuple[Optional[str], bool], Tuple[str, ...]] = {
+    (measurement_mode, strict_mode): _build_dynamic_blocks(measurement_mode, strict_mode)
+    for measurement_mode in _MEASUREMENT_MODES
+    for strict_mode in (False, True)
 }
 
-Rules:
-- NEVER invent information.
-- If a field is not visible on a label or obvious from photos, set it to null.
-- If the SKU tag is unreadable or absent, set sku_status="missing".
-- For SKU: only set sku_status="ok" when a printed label is clearly visible in the foreground (held by a hand or stuck on the product) showing letters followed by digits (e.g. "PTF127"); otherwise leave sku null and set sku_status="missing".
-- Use the exact words printed on the composition tag for "material". Do NOT guess percentages.
-- If colors are not clear, keep main_colors as null instead of guessing.
-- measurement_mode (provided by the UI):
-  - If "etiquette": only use a size visible on a label; do not estimate from measurements.
-  - If "mesures": no label is readable; read flat measurements and estimate a size, filling size_estimated and size_source="estimated". If measurements are unusable, leave size_estimated null.
-  - Never include raw measurements in the JSON.
-- Do NOT translate JSON keys; they must remain in English exactly as written above.
-"""
+
+def _build_prompt_blocks(
+    profile: AnalysisProfile,
+    measurement_mode: Optional[str],
+    strict_mode: bool = False,
+) -> Dict[str, Tuple[str, ...]]:
+    dynamic = _DYNAMIC_BLOCKS.get((measurement_mode, strict_mode))
+    if dynamic is None:
+        dynamic = _build_dynamic_blocks(measurement_mode, strict_mode)
+    return {
+        "cacheable": (_static_prefix(profile),),
+        "dynamic": dynamic,
+    }
+
+
+def _read_ui_options(ui_data: Optional[Dict[str, Any]]) -> Tuple[Optional[str], bool]:
+    ui_data = ui_data or {}
+    return ui_data.get("measurement_mode"), bool(ui_data.get("strict_mode"))
+
+
+def build_full_prompt_blocks(
+    profile: AnalysisProfile,
+    ui_data: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Tuple[str, ...]]:
+    """
+    Découpe le prompt en blocs ordonnés (tuples, à ne pas modifier) :
+
+    - "cacheable" : PROMPT_CONTRACT puis prompt_suffix du profil (statiques,
+                    précalculés en un seul bloc)
+    - "dynamic"   : consignes dépendant de l'UI (FEW_SHOT_EXAMPLES en mode
+                    strict, measurement_mode), à envoyer APRÈS le préfixe
+                    statique
+
+    Les caches de prompt des providers (implicites chez OpenAI / Gemini) ne
+    portent que sur un préfixe identique d'un appel à l'autre : la partie
+    statique doit donc toujours arriver en tête, inchangée.
+    """
+    measurement_mode, strict_mode = _read_ui_options(ui_data)
+    if measurement_mode:
+        logger.debug("build_full_prompt_blocks: measurement_mode fourni: %s", measurement_mode)
+
+    return _build_prompt_blocks(profile, measurement_mode, strict_mode)
+
+
+def get_static_prefix_hash(profile: AnalysisProfile) -> str:
+    """
+    Empreinte blake2b (16 octets, hex) du préfixe statique du profil : stable
+    tant que PROMPT_CONTRACT / prompt_suffix ne changent pas, utilisable comme
+    composante de clé de cache côté client.
+    """
+    if ALL_PROFILES.get(profile.name) is profile:
+        return _PREFIX_HASHES[profile.name]
+    return _hash_prefix(_join_static_prefix(profile))
+
+
+def estimate_full_prompt_tokens(
+    profile: AnalysisProfile,
+    ui_data: Optional[Dict[str, Any]] = None,
+) -> int:
+    """
+    Estimation du nombre de tokens du prompt texte (hors images) : compte
+    précalculé du préfixe statique + estimation des seuls blocs dynamiques.
+    """
+    if ALL_PROFILES.get(profile.name) is profile:
+        prefix_tokens = _PREFIX_TOKENS[profile.name]
+    else:
+        prefix_tokens = estimate_prompt_tokens(_join_static_prefix(profile))
+
+    measurement_mode, strict_mode = _read_ui_options(ui_data)
+    dynamic = _build_prompt_blocks(profile, measurement_mode, strict_mode)["dynamic"]
+    return prefix_tokens + sum(estimate_prompt_tokens(block) for block in dynamic)
+
+
+def request_cache_key(
+    profile: AnalysisProfile,
+    ui_data: Optional[Dict[str, Any]],
+    image_bytes_list: Sequence[bytes],
+) -> str:
+    """
+    Clé de cache de réponse côté client : même préfixe statique, mêmes blocs
+    dynamiques et mêmes images (ordre indifférent) -> même clé. Les autres
+    champs de ui_data (tailles, SKU...) n'interviennent qu'à la
+    normalisation et ne font donc pas partie de la clé.
+    """
+    measurement_mode, strict_mode = _read_ui_options(ui_data)
+    digest = blake2b(digest_size=16)
+    digest.update(get_static_prefix_hash(profile).encode("ascii"))
+    for block in _build_prompt_blocks(profile, measurement_mode, strict_mode)["dynamic"]:
+        digest.update(_hash_prefix(block).encode("ascii"))
+    for image_hash in sorted(blake2b(data, digest_size=16).digest() for data in image_bytes_list):
+        digest.update(image_hash)
+    return digest.hexdigest()
+
+
+_check_cacheable_prefixes()
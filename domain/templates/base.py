@@ -3,12 +3,31 @@
 from __future__ import annotations
 
 import logging
+import re
 from dataclasses import dataclass
 from enum import Enum
 from typing import Dict, Any
 
 logger = logging.getLogger(__name__)
 
+# Compactage des prompts (distinct du nettoyage des descriptions générées)
+_PROMPT_TRAILING_SPACES_RE = re.compile(r"[ \t]+$", re.MULTILINE)
+_PROMPT_BLANK_LINES_RE = re.compile(r"\n{3,}")
+_PROMPT_INDENT_RE = re.compile(r"^ +", re.MULTILINE)
+
+
+def compact_prompt(text: str) -> str:
+    """
+    Compacte un texte de prompt au chargement du profil : espaces de fin de
+    ligne supprimés, au plus une ligne vide consécutive, indentation divisée
+    par deux (la hiérarchie des listes est conservée), sans lignes vides en
+    tête ni en fin. Les espaces sont facturés comme le reste du prompt.
+    """
+    text = _PROMPT_TRAILING_SPACES_RE.sub("", text)
+    text = _PROMPT_BLANK_LINES_RE.sub("\n\n", text)
+    text = _PROMPT_INDENT_RE.sub(lambda match: " " * ((len(match.group(0)) + 1) // 2), text)
+    return text.strip("\n")
+
 
 class AnalysisProfileName(Enum):
     """
@@ -20,7 +39,7 @@ class AnalysisProfileName(Enum):
     PULL_TOMMY = "pull_tommy"
 
 
-@dataclass
+@dataclass(slots=True)
 class AnalysisProfile:
     """
     Profil d'analyse pour un type de vêtement.
@@ -10,61 +10,68 @@ from .base import (
     AnalysisProfile,
     AnalysisProfileName,
     BASE_LISTING_SCHEMA,
+    compact_prompt,
 )
 
 logger = logging.getLogger(__name__)
 
 # --------------------------------------------------------------------
 # Schéma spécialisé pour les jeans
-# On part du schéma de base, mais on ajoute:
-# - sku (str)
-# - sku_status (ok / missing / low_confidence)
+# On part du schéma de base, et on ajoute l'objet imbriqué "features"
+# (lu par normalize_and_postprocess). Il est rendu dans le prompt du profil
+# (voir domain/prompt.py) au lieu d'être décrit en prose dans le contrat.
 # --------------------------------------------------------------------
 
 JEAN_LISTING_SCHEMA = deepcopy(BASE_LISTING_SCHEMA)
 
 # Ajout des champs JEAN spécifiques
-JEAN_LISTING_SCHEMA["properties"].update(
-    {
-        "sku": {
-            "type": "string",
-            "description": "Numéro interne lu depuis la photo SKU. Exemple: JLF87."
-        },
-        "sku_status": {
-            "type": "string",
-            "description": "Statut d'extraction SKU: ok, missing, low_confidence.",
-            "enum": ["ok", "missing", "low_confidence"]
-        },
+JEAN_LISTING_SCHEMA["properties"]["features"] = {
+    "type": "object",
+    "properties": {
+        "brand": {"type": ["string", "null"]},
         "model": {
-            "type": "string",
+            "type": ["string", "null"],
             "description": "Modèle Levi's si visible (501, 505, 511, etc.)."
         },
         "fit": {
-            "type": "string",
+            "type": ["string", "null"],
             "description": "Coupe: skinny, slim, straight/droit, bootcut/évasé, etc."
         },
+        "color": {
+            "type": ["string", "null"],
+            "description": "Couleur dominante détectée: noir, bleu brut, etc."
+        },
+        "size_fr": {"type": ["string", "null"]},
+        "size_us": {"type": ["string", "null"]},
         "length": {
-            "type": "string",
+            "type": ["string", "null"],
             "description": "Longueur lisible sur l’étiquette (ex: L34)."
         },
         "cotton_percent": {
-            "type": "number",
+            "type": ["number", "null"],
             "description": "% coton si visible sur l’étiquette de composition."
         },
         "elasthane_percent": {
-            "type": "number",
+            "type": ["number", "null"],
             "description": "% élasthanne si > 2%, sinon ne pas inventer."
         },
+        "rise_type": {"type": ["string", "null"]},
+        "rise_cm": {"type": ["number", "null"]},
         "gender": {
-            "type": "string",
+            "type": ["string", "null"],
             "description": "Genre détecté: homme, femme, ou incertain.",
         },
-        "color": {
+        "sku": {
+            "type": ["string", "null"],
+            "description": "Numéro interne lu depuis la photo SKU. Exemple: JLF87."
+        },
+        "sku_status": {
             "type": "string",
-            "description": "Couleur dominante détectée: noir, bleu brut, etc."
+            "description": "Statut d'extraction SKU: ok, missing, low_confidence.",
+            "enum": ["ok", "missing", "low_confidence"]
         },
-    }
-)
+    },
+}
 
 # NOTA:
 # - On NE modifie PAS les 'required' ici.
@@ -83,7 +90,7 @@ JEANS_PROFILES: Dict[AnalysisProfileName, AnalysisProfile] = {
     AnalysisProfileName.JEAN_LEVIS: AnalysisProfile(
         name=AnalysisProfileName.JEAN_LEVIS,
         json_schema=JEAN_LISTING_SCHEMA,
-        prompt_suffix=r"""
+        prompt_suffix=compact_prompt(r"""
 PROFILE TYPE: JEAN LEVI'S
 
 You are analyzing multiple photos of a single Levi's denim jean.
@@ -145,7 +152,7 @@ OUTPUT FORMAT:
 - Respond ONLY in pure JSON with all keys defined in the schema.
 - No text outside JSON.
 - No commentary.
-""",
+"""),
     ),
 }
 
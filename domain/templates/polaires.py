@@ -5,7 +5,7 @@ from __future__ import annotations
 import logging
 from typing import Dict
 
-from .base import AnalysisProfile, AnalysisProfileName, BASE_LISTING_SCHEMA
+from .base import AnalysisProfile, AnalysisProfileName, BASE_LISTING_SCHEMA, compact_prompt
 
 logger = logging.getLogger(__name__)
 
@@ -13,7 +13,7 @@ logger = logging.getLogger(__name__)
 POLAIRES_PROFILES: Dict[AnalysisProfileName, AnalysisProfile] = {
     AnalysisProfileName.POLAIRE_OUTDOOR: AnalysisProfile(
         name=AnalysisProfileName.POLAIRE_OUTDOOR,
-        prompt_suffix=r"""
+        prompt_suffix=compact_prompt(r"""
 PROFILE TYPE: POLAIRE OUTDOOR
 
 The item is an outdoor fleece (polaire) used for hiking, camping, or cold weather.
@@ -95,7 +95,7 @@ JSON SCHEMA:
 - Use the SAME JSON keys as defined in the main prompt contract:
   "title", "description", "brand", "style", "pattern", "neckline", "season", "defects".
 - Do NOT add or rename keys.
-""",
+"""),
         json_schema=BASE_LISTING_SCHEMA,
     ),
 }
@@ -3,17 +3,78 @@
 from __future__ import annotations
 
 import logging
+from copy import deepcopy
 from typing import Dict
 
-from .base import AnalysisProfile, AnalysisProfileName, BASE_LISTING_SCHEMA
+from .base import AnalysisProfile, AnalysisProfileName, BASE_LISTING_SCHEMA, compact_prompt
 
 logger = logging.getLogger(__name__)
 
+# --------------------------------------------------------------------
+# Schéma spécialisé pour les pulls
+# Schéma de base + objet imbriqué "features" (lu par normalize_and_postprocess),
+# rendu dans le prompt du profil (voir domain/prompt.py).
+# --------------------------------------------------------------------
+
+PULL_LISTING_SCHEMA = deepcopy(BASE_LISTING_SCHEMA)
+
+PULL_LISTING_SCHEMA["properties"]["features"] = {
+    "type": "object",
+    "properties": {
+        "brand": {"type": ["string", "null"]},
+        "garment_type": {
+            "type": ["string", "null"],
+            "description": '"pull", "gilet", "cardigan" or similar',
+        },
+        "neckline": {
+            "type": ["string", "null"],
+            "description": "col rond, col V, col zippé/ montant, col roulé",
+        },
+        "pattern": {
+            "type": ["string", "null"],
+            "description": "uni, torsadé, rayé, colorblock, etc.",
+        },
+        "main_colors": {
+            "type": ["array", "null"],
+            "items": {"type": "string"},
+            "description": 'key colors seen (e.g. ["bleu", "blanc", "rouge"])',
+        },
+        "material": {
+            "type": ["string", "null"],
+            "description": 'raw composition label text (e.g. "80% laine 20% nylon")',
+        },
+        "cotton_percent": {"type": ["number", "null"]},
+        "wool_percent": {"type": ["number", "null"]},
+        "gender": {
+            "type": ["string", "null"],
+            "description": "homme / femme / unisexe if visible",
+        },
+        "size": {
+            "type": ["string", "null"],
+            "description": "tag size from the label (e.g. S, M, L, XL, XXL...)",
+        },
+        "size_estimated": {
+            "type": ["string", "null"],
+            "description": 'ONLY when measurement_mode="mesures" and no label is readable',
+        },
+        "size_source": {
+            "type": ["string", "null"],
+            "enum": ["label", "estimated", None],
+            "description": "origin of the size value",
+        },
+        "sku": {"type": ["string", "null"]},
+        "sku_status": {
+            "type": "string",
+            "enum": ["ok", "missing", "low_confidence"],
+        },
+    },
+}
+
 
 PULLS_PROFILES: Dict[AnalysisProfileName, AnalysisProfile] = {
     AnalysisProfileName.PULL_TOMMY: AnalysisProfile(
         name=AnalysisProfileName.PULL_TOMMY,
-        prompt_suffix=r"""
+        prompt_suffix=compact_prompt(r"""
 PROFILE TYPE: PULL TOMMY HILFIGER / PREPPY KNIT
 
 The item is a knit sweater (pull) with a preppy / Tommy Hilfiger style.
@@ -95,16 +156,29 @@ FOCUS ON:
        - éventuelle composition (si lisible),
        - état général et défauts.
 
+9) FEATURES OBJECT:
+   - sku_status="ok" only when a printed label is clearly visible in the foreground
+     (held by a hand or stuck on the product) showing letters followed by digits
+     (e.g. "PTF127"); otherwise sku=null and sku_status="missing".
+   - "material": the exact words printed on the composition tag; never guess percentages.
+   - Unclear colors: main_colors=null.
+   - measurement_mode (provided by the UI):
+     - "etiquette": only use a size visible on a label; do not estimate from measurements.
+     - "mesures": no label is readable; estimate a size from the flat measurements,
+       filling size_estimated and size_source="estimated" (null if measurements are unusable).
+     - Never include raw measurements in the JSON.
+
 JSON SCHEMA:
 - Use the SAME JSON keys as defined in the main prompt contract:
-  "title", "description", "brand", "style", "pattern", "neckline", "season", "defects".
-- Do NOT add extra keys, and do NOT change key names.
-""",
-        json_schema=BASE_LISTING_SCHEMA,
+  "title", "description", "brand", "style", "pattern", "neckline", "season", "defects",
+  plus the nested "features" object described above.
+- Do NOT add other keys, and do NOT change key names.
+"""),
+        json_schema=PULL_LISTING_SCHEMA,
     ),
 }
 
 logger.debug(
     "Profil PULL_TOMMY chargé avec schéma %s",
-    list(BASE_LISTING_SCHEMA["properties"].keys()),
+    list(PULL_LISTING_SCHEMA["properties"].keys()),
 )
@@ -12,9 +12,15 @@ from config.settings import Settings
 from domain.ai_provider import AIListingProvider, AIProviderName
 from domain.json_utils import safe_json_parse
 from domain.models import VintedListing
-from domain.prompt import PROMPT_CONTRACT
+from domain.prompt import (
+    build_full_prompt_blocks,
+    estimate_full_prompt_tokens,
+    get_static_prefix_hash,
+    request_cache_key,
+)
 from domain.templates import AnalysisProfile
 from domain.normalizer import normalize_and_postprocess
+from infrastructure.response_cache import ResponseCache
 
 logger = logging.getLogger(__name__)
 
@@ -33,8 +39,12 @@ class GeminiListingClient(AIListingProvider):
     et renvoie un VintedListing.
 
     IMPORTANT :
-    - On NE demande PAS de structured output via response_schema.
-    - On se contente d'un prompt très strict qui exige une réponse JSON.
+    - On NE demande PAS de structured output via response_schema : les
+      schémas des profils utilisent des unions ["string", "null"] que Gemini
+      refuse, et le mode strict d'OpenAI exigerait toutes les clés en
+      "required" plus additionalProperties: false à chaque niveau.
+    - On active seulement le mode JSON natif (response_mime_type), le prompt
+      décrivant les clés attendues.
     - On parse ensuite ce JSON avec safe_json_parse.
     """
 
@@ -45,6 +55,7 @@ class GeminiListingClient(AIListingProvider):
 
         genai.configure(api_key=settings.gemini_api_key)
         self._model_name = settings.gemini_model
+        self._response_cache = ResponseCache()
 
         logger.info("GeminiListingClient initialisé (model=%s).", self._model_name)
 
@@ -86,7 +97,23 @@ class GeminiListingClient(AIListingProvider):
         )
 
         try:
-            raw_text = self._call_api(paths, profile, ui_data=ui_data)
+            parts = self._build_parts(paths, profile, ui_data=ui_data)
+
+            # Même prompt + mêmes images -> réponse déjà obtenue, pas d'appel réseau
+            cache_key = request_cache_key(
+                profile,
+                ui_data,
+                [part["data"] for part in parts if isinstance(part, dict)],
+            )
+            # force_refresh (bouton "Régénérer") : nouvel appel, le cache est ignoré
+            raw_text = None
+            if not (ui_data or {}).get("force_refresh"):
+                raw_text = self._response_cache.get(cache_key)
+            from_cache = raw_text is not None
+            if raw_text is None:
+                raw_text = self._call_api(parts, profile, ui_data=ui_data)
+            else:
+                logger.info("Réponse Gemini reprise du cache local (%s).", cache_key)
             logger.debug("Gemini brut: %s", raw_text[:400])
 
             # JSON robuste (si jamais il y a des ```json ....```, safe_json_parse gère)
@@ -95,6 +122,9 @@ class GeminiListingClient(AIListingProvider):
                 raise GeminiClientError(
                     "Réponse Gemini illisible (JSON invalide ou introuvable)."
                 )
+            if not from_cache:
+                # Seule une vraie réponse API (re)démarre le TTL de l'entrée
+                self._response_cache.set(cache_key, raw_text)
 
             # Post-traitement + normalisation (titre JEAN_LEVIS, mapping clés, etc.)
             normalized = normalize_and_postprocess(
@@ -127,37 +157,15 @@ class GeminiListingClient(AIListingProvider):
         """
         Construit une liste de "parts" pour google-generativeai :
 
-        - d'abord le texte (PROMPT_CONTRACT + prompt_suffix)
+        - d'abord le préfixe statique (PROMPT_CONTRACT + prompt_suffix), toujours
+          identique pour un profil donné -> éligible au cache implicite Gemini
+        - puis les consignes dynamiques de l'UI (measurement_mode)
         - ensuite toutes les images (SKU, vues, étiquettes, mesures) du même article
         """
-        # Texte : contrat global + profil spécialisé
-        full_prompt = PROMPT_CONTRACT + "\n\n" + profile.prompt_suffix
-
-        measurement_mode = None
-        try:
-            measurement_mode = (ui_data or {}).get("measurement_mode")
-            if measurement_mode:
-                logger.debug(
-                    "Gemini._build_parts: measurement_mode fourni: %s",
-                    measurement_mode,
-                )
-        except Exception as exc:  # pragma: no cover - defensive
-            logger.warning(
-                "Gemini._build_parts: lecture measurement_mode impossible (%s)",
-                exc,
-            )
-            measurement_mode = None
-
-        parts: List[Any] = [full_prompt]
+        blocks = build_full_prompt_blocks(profile, ui_data)
 
-        if measurement_mode:
-            parts.append(
-                (
-                    f"Mode de relevé UI : {measurement_mode}. "
-                    "Si measurement_mode=mesures, estime la taille depuis les mesures à plat "
-                    "quand aucune étiquette n'est lisible, sans inventer ni lister les mesures."
-                )
-            )
+        parts: List[Any] = ["\n\n".join(blocks["cacheable"])]
+        parts.extend(blocks["dynamic"])
 
         for path in image_paths:
             if not path.exists():
@@ -185,26 +193,26 @@ class GeminiListingClient(AIListingProvider):
 
     def _call_api(
         self,
-        image_paths: List[Path],
+        parts: List[Any],
         profile: AnalysisProfile,
         ui_data: Dict[str, Any] | None = None,
     ) -> str:
         """
-        Appelle l'API Gemini en mode "simple" :
-        - pas de response_schema
-        - pas de response_mime_type
-        - on s'appuie sur le prompt pour exiger un JSON
+        Appelle l'API Gemini en mode JSON avec les parts de _build_parts :
+        - response_mime_type="application/json" (sortie JSON brute, sans prose)
+        - pas de response_schema : les clés attendues sont décrites par le prompt
 
-        On attend donc que response.text soit une chaîne JSON (éventuellement encadrée
-        par des ```json ... ```).
+        On attend donc que response.text soit une chaîne JSON ; safe_json_parse
+        tolère encore d'éventuels ```json ... ```.
         """
-        parts = self._build_parts(image_paths, profile, ui_data=ui_data)
-
-        logger.debug(
-            "Appel API Gemini (model=%s, nb_images=%d)...",
-            self._model_name,
-            len(image_paths),
-        )
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Appel API Gemini (model=%s, nb_images=%d, ~%d tokens de prompt, préfixe=%s)...",
+                self._model_name,
+                sum(isinstance(part, dict) for part in parts),
+                estimate_full_prompt_tokens(profile, ui_data),
+                get_static_prefix_hash(profile),
+            )
 
         try:
             model = genai.GenerativeModel(self._model_name)
@@ -214,6 +222,7 @@ class GeminiListingClient(AIListingProvider):
                 generation_config={
                     "temperature": 0.2,
                     "top_p": 0.9,
+                    "response_mime_type": "application/json",
                 },
             )
 
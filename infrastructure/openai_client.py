@@ -13,9 +13,15 @@ from config.settings import Settings
 from domain.ai_provider import AIListingProvider, AIProviderName
 from domain.models import VintedListing
 from domain.templates import AnalysisProfile
-from domain.prompt import PROMPT_CONTRACT
+from domain.prompt import (
+    build_full_prompt_blocks,
+    estimate_full_prompt_tokens,
+    get_static_prefix_hash,
+    request_cache_key,
+)
 from domain.json_utils import safe_json_parse
 from domain.normalizer import normalize_and_postprocess
+from infrastructure.response_cache import ResponseCache
 
 logger = logging.getLogger(__name__)
 
@@ -42,6 +48,7 @@ class OpenAIListingClient(AIListingProvider):
         self.api_key = settings.openai_api_key
         self.model = settings.openai_model
         self.endpoint = "https://api.openai.com/v1/chat/completions"
+        self._response_cache = ResponseCache()
 
         logger.info("OpenAIListingClient initialisé (model=%s).", self.model)
 
@@ -85,14 +92,27 @@ class OpenAIListingClient(AIListingProvider):
             # 1) Encodage de toutes les images
             images_b64 = [self._encode_image(p) for p in image_paths]
 
-            # 2) Construction du payload (prompt contractuel + profil + multi-images)
-            payload = self._build_payload(images_b64, profile, ui_data=ui_data)
-
-            # 3) Appel API OpenAI
-            response_json = self._call_api(payload)
-
-            # 4) Récupération du texte (JSON brut) renvoyé par le modèle
-            raw_text = self._extract_json(response_json)
+            # 2) Même prompt + mêmes images -> réponse déjà obtenue, pas d'appel réseau
+            cache_key = request_cache_key(
+                profile,
+                ui_data,
+                [img_b64.encode("ascii") for img_b64 in images_b64],
+            )
+            # force_refresh (bouton "Régénérer") : nouvel appel, le cache est ignoré
+            raw_text = None
+            if not (ui_data or {}).get("force_refresh"):
+                raw_text = self._response_cache.get(cache_key)
+            from_cache = raw_text is not None
+
+            if raw_text is None:
+                # 3) Construction du payload (prompt contractuel + profil + multi-images)
+                payload = self._build_payload(images_b64, profile, ui_data=ui_data)
+
+                # 4) Appel API OpenAI + récupération du texte (JSON brut) renvoyé par le modèle
+                response_json = self._call_api(payload)
+                raw_text = self._extract_json(response_json)
+            else:
+                logger.info("Réponse OpenAI reprise du cache local (%s).", cache_key)
 
             # 5) Parsing “tolérant” du JSON
             parsed = safe_json_parse(raw_text)
@@ -100,6 +120,9 @@ class OpenAIListingClient(AIListingProvider):
                 raise OpenAIClientError(
                     "Réponse OpenAI illisible (JSON invalide ou introuvable)."
                 )
+            if not from_cache:
+                # Seule une vraie réponse API (re)démarre le TTL de l'entrée
+                self._response_cache.set(cache_key, raw_text)
 
             # 6) Post-traitement + normalisation (titre JEAN_LEVIS, mapping clés, etc.)
             normalized = normalize_and_postprocess(
@@ -152,97 +175,83 @@ class OpenAIListingClient(AIListingProvider):
     ) -> Dict[str, Any]:
         """
         Construit le payload JSON pour /v1/chat/completions avec :
-        - message système : contrat + suffixe de profil
-        - message user : consignes + toutes les images
+        - message système : contrat + suffixe de profil (préfixe statique, en tête
+          pour bénéficier du cache de prompt implicite d'OpenAI)
+        - message user : consignes (dont les consignes dynamiques UI) + toutes les images
         - response_format json_object (OpenAI formate la sortie en JSON)
-        """
-        try:
-            # Prompt système = contrat général + instructions spécifiques au profil
-            full_prompt = PROMPT_CONTRACT + "\n\n" + profile.prompt_suffix
-
-            measurement_mode = None
-            try:
-                measurement_mode = (ui_data or {}).get("measurement_mode")
-                if measurement_mode:
-                    logger.debug(
-                        "OpenAI._build_payload: measurement_mode fourni: %s",
-                        measurement_mode,
-                    )
-            except Exception as exc:  # pragma: no cover - defensive
-                logger.warning(
-                    "OpenAI._build_payload: lecture measurement_mode impossible (%s)",
-                    exc,
-                )
-                measurement_mode = None
 
-            # Contenu utilisateur : texte + toutes les images
-            user_instruction = (
+        Pas de try/except ici : uniquement des constantes et des lectures de
+        dict ; generate_listing convertit déjà toute erreur en OpenAIClientError.
+        """
+        # Prompt système = contrat général + instructions spécifiques au profil
+        blocks = build_full_prompt_blocks(profile, ui_data)
+        full_prompt = "\n\n".join(blocks["cacheable"])
+
+        # Contenu utilisateur : texte (consigne + blocs dynamiques séparés par
+        # une ligne vide) + toutes les images
+        user_instruction = "\n\n".join(
+            (
                 "Analyse l'ensemble des images ci-dessous. "
                 "Il s'agit du même vêtement photographié sous différents angles, "
                 "avec des étiquettes et des mesures à plat. "
                 "Génère une annonce Vinted (titre + description) en respectant "
-                "strictement le contrat JSON décrit dans le message système."
+                "strictement le contrat JSON décrit dans le message système.",
+                *blocks["dynamic"],
             )
+        )
 
-            if measurement_mode:
-                user_instruction += (
-                    f" Mode de relevé fourni par l'UI : {measurement_mode}. "
-                    "Si measurement_mode=mesures, la taille doit être estimée depuis les "
-                    "mesures à plat quand aucune étiquette n'est lisible."
-                )
+        user_content: List[Dict[str, Any]] = [
+            {
+                "type": "text",
+                "text": user_instruction,
+            }
+        ]
 
-            user_content: List[Dict[str, Any]] = [
+        for img_b64 in images_b64:
+            user_content.append(
                 {
-                    "type": "text",
-                    "text": user_instruction,
+                    "type": "image_url",
+                    "image_url": {
+                        "url": f"data:image/jpeg;base64,{img_b64}",
+                    },
                 }
-            ]
-
-            for img_b64 in images_b64:
-                user_content.append(
-                    {
-                        "type": "image_url",
-                        "image_url": {
-                            "url": f"data:image/jpeg;base64,{img_b64}",
-                        },
-                    }
-                )
+            )
 
-            payload: Dict[str, Any] = {
-                "model": self.model,
-                # On demande à OpenAI de formater la sortie en JSON,
-                # mais on ne lui passe plus de json_schema complexe.
-                "response_format": {"type": "json_object"},
-                "messages": [
-                    {
-                        "role": "system",
-                        "content": [
-                            {
-                                "type": "text",
-                                "text": full_prompt,
-                            }
-                        ],
-                    },
-                    {
-                        "role": "user",
-                        "content": user_content,
-                    },
-                ],
-                "temperature": 0.2,
-                "top_p": 1.0,
-            }
+        payload: Dict[str, Any] = {
+            "model": self.model,
+            # On demande à OpenAI de formater la sortie en JSON,
+            # mais on ne lui passe plus de json_schema complexe.
+            "response_format": {"type": "json_object"},
+            "messages": [
+                {
+                    "role": "system",
+                    "content": [
+                        {
+                            "type": "text",
+                            "text": full_prompt,
+                        }
+                    ],
+                },
+                {
+                    "role": "user",
+                    "content": user_content,
+                },
+            ],
+            "temperature": 0.2,
+            "top_p": 1.0,
+        }
 
+        if logger.isEnabledFor(logging.DEBUG):
             logger.debug(
-                "Payload OpenAI construit (%d images, model=%s, measurement_mode=%s).",
+                "Payload OpenAI construit (%d images, model=%s, blocs dynamiques=%d, "
+                "~%d tokens de prompt, préfixe=%s).",
                 len(images_b64),
                 self.model,
-                measurement_mode,
+                len(blocks["dynamic"]),
+                estimate_full_prompt_tokens(profile, ui_data),
+                get_static_prefix_hash(profile),
             )
-            return payload
-
-        except Exception as exc:
-            logger.exception("Erreur build payload OpenAI.")
-            raise OpenAIClientError(f"Erreur build payload: {exc}") from exc
+        return payload
 
     # ------------------------------------------------------------------
     # Appel HTTP
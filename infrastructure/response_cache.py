@@ -0,0 +1,51 @@
+# infrastructure/response_cache.py
+
+from __future__ import annotations
+
+import logging
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class ResponseCache:
+    """
+    Cache LRU en mémoire des réponses brutes (texte JSON) d'un provider IA.
+
+    - clé   : domain.prompt.request_cache_key (prompt + contenu des images)
+    - TTL   : une entrée expirée est ignorée puis supprimée à la lecture
+    - borne : au-delà de maxsize, l'entrée la moins récemment utilisée sort
+
+    Évite de repayer un appel réseau quand le même article est resoumis
+    (nouvel essai, debug, ré-import des mêmes photos).
+    """
+
+    def __init__(self, maxsize: int = 64, ttl_seconds: float = 24 * 3600) -> None:
+        self._maxsize = maxsize
+        self._ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[str]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        stored_at, value = entry
+        if time.monotonic() - stored_at > self._ttl_seconds:
+            del self._entries[key]
+            logger.debug("ResponseCache: entrée expirée (%s).", key)
+            return None
+
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: str) -> None:
+        self._entries[key] = (time.monotonic(), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
@@ -23,6 +23,15 @@ from .image_preview import ImagePreview  # <- widget réutilisé depuis l’anci
 
 logger = logging.getLogger(__name__)
 
+# Profils qui affichent la méthode de relevé (étiquette / mesures) au lieu
+# des tailles FR/US.
+_MEASURE_MODE_PROFILES = frozenset(
+    {
+        AnalysisProfileName.POLAIRE_OUTDOOR,
+        AnalysisProfileName.PULL_TOMMY,
+    }
+)
+
 
 class VintedAIApp(ctk.CTk):
     """
@@ -57,6 +66,7 @@ class VintedAIApp(ctk.CTk):
         self.size_fr_var = ctk.StringVar(value="")
         self.size_us_var = ctk.StringVar(value="")
         self.measure_mode_var = ctk.StringVar(value="etiquette")
+        self.strict_mode_var = ctk.BooleanVar(value=False)
 
         # Gestion des images
         self.selected_images: List[Path] = []
@@ -148,6 +158,14 @@ class VintedAIApp(ctk.CTk):
             )
             profile_combo.pack(anchor="w", pady=5)
 
+            # Mode strict : ajoute les exemples à faire / ne pas faire au prompt
+            strict_checkbox = ctk.CTkCheckBox(
+                left_frame,
+                text="Mode strict (exemples détaillés)",
+                variable=self.strict_mode_var,
+            )
+            strict_checkbox.pack(anchor="w", pady=5)
+
             # --- Inputs manuels (v1 simple) ---
             self.size_inputs_frame = ctk.CTkFrame(left_frame)
             self.size_inputs_frame.pack(anchor="w", fill="x", pady=(10, 0))
@@ -203,15 +221,28 @@ class VintedAIApp(ctk.CTk):
 
     def _build_generate_button(self, parent: ctk.CTkFrame) -> None:
         try:
+            buttons_frame = ctk.CTkFrame(parent, fg_color="transparent")
+            buttons_frame.pack(anchor="e", padx=10, pady=(0, 10))
+
             generate_btn = ctk.CTkButton(
-                parent,
+                buttons_frame,
                 text="Générer",
                 command=self.generate_listing,
                 width=120,
             )
-            generate_btn.pack(anchor="e", padx=10, pady=(0, 10))
+            generate_btn.pack(side="right")
+
+            # Régénérer : ignore la réponse mise en cache pour les mêmes photos
+            # et redemande une nouvelle proposition au provider.
+            regenerate_btn = ctk.CTkButton(
+                buttons_frame,
+                text="Régénérer",
+                command=lambda: self.generate_listing(force_refresh=True),
+                width=120,
+            )
+            regenerate_btn.pack(side="right", padx=(0, 8))
 
-            logger.info("Bouton de génération positionné sous la zone de résultat.")
+            logger.info("Boutons de génération positionnés sous la zone de résultat.")
         except Exception as exc:
             logger.error(
                 "Erreur lors de l'initialisation du bouton de génération: %s", exc, exc_info=True
@@ -459,16 +490,15 @@ class VintedAIApp(ctk.CTk):
     # Provider & profil
     # ------------------------------------------------------------------
 
-    def _profile_requires_measure_mode(self, profile_key: str) -> bool:
-        return profile_key in {
-            AnalysisProfileName.POLAIRE_OUTDOOR.value,
-            AnalysisProfileName.PULL_TOMMY.value,
-        }
+    def _profile_requires_measure_mode(self, profile: Optional[AnalysisProfile]) -> bool:
+        return profile is not None and profile.name in _MEASURE_MODE_PROFILES
 
     def _update_profile_ui(self) -> None:
         try:
             profile_key = self.profile_var.get()
-            uses_measure_mode = self._profile_requires_measure_mode(profile_key)
+            uses_measure_mode = self._profile_requires_measure_mode(
+                self._get_selected_profile()
+            )
 
             if uses_measure_mode:
                 if self.size_inputs_frame:
@@ -522,7 +552,7 @@ class VintedAIApp(ctk.CTk):
     # Génération
     # ------------------------------------------------------------------
 
-    def generate_listing(self) -> None:
+    def generate_listing(self, force_refresh: bool = False) -> None:
         if not self.selected_images:
             messagebox.showwarning(
                 "Images manquantes",
@@ -556,7 +586,7 @@ class VintedAIApp(ctk.CTk):
         self.result_text.delete("1.0", "end")
 
         # ---- UI DATA (v1 simple) ----
-        profile_requires_measure = self._profile_requires_measure_mode(profile.name.value)
+        profile_requires_measure = self._profile_requires_measure_mode(profile)
 
         if profile_requires_measure:
             measurement_mode = self.measure_mode_var.get()
@@ -581,6 +611,9 @@ class VintedAIApp(ctk.CTk):
                 profile.name.value,
             )
 
+        ui_data["strict_mode"] = self.strict_mode_var.get()
+        ui_data["force_refresh"] = force_refresh
+
         try:
             listing: VintedListing = provider.generate_listing(
                 self.selected_images,